@@ -1,5 +1,5 @@
 """Module Name: auc_client_rdt.py
-Description: This script implements a client that can either act as a seller or a buyer. Sellers submit auction requests, while buyers submit bids. Reliable data transfer is implemented using a stop-and-wait protocol with optional packet loss simulation.
+Description: This script implements a client that can either act as a seller or a buyer. Sellers submit auction requests, while buyers submit bids. Reliable data transfer is implemented using a sliding-window (selective repeat) protocol with optional packet loss simulation.
 
 Developer Information:
 -----------------------
@@ -14,7 +14,7 @@ Features:
 ---------
 - Operates as a seller or buyer based on the server's initial response.
 - Implements bidding logic for buyers and auction request logic for sellers.
-- Uses a stop-and-wait protocol for reliable data transfer over UDP.
+- Uses a sliding-window protocol with selective acknowledgments for reliable data transfer over UDP.
 - Simulates packet loss to test the robustness of the communication.
 
 Usage:
@@ -23,28 +23,88 @@ Run this script to connect to the auction server as either a seller or buyer. Th
 
 Example:
 --------
-$ python3 auc_client_rdt.py <Server IP Address> <ServerPort> <RDT Port> <rate>
+$ python3 auc_client_rdt.py <Server IP Address> <ServerPort> <RDT Port> <rate> [--quiet]
 
 Where:
 '<Server IP Address>' - the IP address of the auction server that the client will connect to
 '<ServerPort>' - the TCP port number on which the auction server is listening for incoming connections
 '<RDT Port>' - the UDP port number that will be used for the reliable data transfer (RDT) protocol implementation
-'<rate>' - the packet loss rate to be simulated for testing the RDT protocol. It's a value between [0.0, 1.0], where: 0.0 means no packet loss"""
+'<rate>' - the packet loss rate to be simulated for testing the RDT protocol. It's a value between [0.0, 1.0], where: 0.0 means no packet loss
+'--quiet' - optional flag that suppresses the per-packet RDT trace messages"""
 
 
+import logging
+import os
+import queue
+import selectors
 import socket
+import select
+import struct
 import sys
+import threading
 import time
 import random
+import re
+
+# Per-packet RDT trace output; silenced unless the client runs in verbose mode
+logger = logging.getLogger(__name__)
+
+# Auction result parsers for the seller ("... sold for $<price>. Winning buyer IP: <ip>") and the winning buyer
+SOLD_RE = re.compile(r"sold for \$(?P<price>\d+).*?Winning buyer IP:\s*(?P<ip>\S+)", re.S)
+SELLER_IP_RE = re.compile(r"^SELLER_IP\s+(\S+)\s*$", re.M)
+
+# Every TCP message is prefixed with its body length as a 32-bit big-endian integer
+FRAME = struct.Struct("!I")
+
+# Binary auction request (type, lowest price, number of bids, item-name length; the UTF-8 name follows) and bid bodies
+AUCTION_REQ = struct.Struct("!BIIH")
+BID = struct.Struct("!I")
+
+# RDT packet header: 32-bit sequence number followed by a type flag (0: control/ack, 1: data)
+HDR = struct.Struct("!IB")
+HDR_SIZE = HDR.size
+
+# Bounds for the adaptive retransmission timeout (seconds)
+MIN_RTO = 0.01
+INITIAL_RTO_MAX = 0.2
+MAX_RTO = 1.0
+
+# Requested kernel send/receive buffer size for the RDT sockets (clamped by net.core.[rw]mem_max)
+UDP_SOCKET_BUFFER = 4 << 20
+
+# Maximum number of queued datagrams the receiver drains per wakeup before acknowledging them together
+RECV_BATCH = 64
+
+
+def make_drop_fn(packet_loss_prob):
+    """Return a no-argument callable deciding whether to simulate dropping the current packet."""
+    if not packet_loss_prob:
+        return lambda: False  # No loss simulation, skip the random draw entirely
+    rand = random.random
+    return lambda: rand() < packet_loss_prob
+
 
 class AuctionClient:
-    def __init__(self, host, port, udp_port, packet_loss_prob=None):
-        """Initialize the client with the server's host, port, UDP port, and optional packet loss probability."""
+    def __init__(self, host, port, udp_port, packet_loss_prob=None, chunk_size=1400, window_size=32, verbose=True):
+        """Initialize the client with the server's host, port, UDP port, optional packet loss probability and RDT tuning."""
         self.host = host
         self.port = port
         self.udp_port = udp_port
         self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # Create a TCP socket
+        self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Send small bids/replies without Nagle delay
+        self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)  # Detect a vanished server
+        self.selector = selectors.DefaultSelector()  # Watches the server socket and the user's input together
+        self.stdin_selectable = False  # False when stdin is e.g. a regular file, which is read directly
+        self.stdin_eof = False
+        self.input_buffer = bytearray()  # User input not yet consumed as a complete line
+        self.recv_buffer = bytearray()  # Server data received but not yet returned as a complete message
+        self.recv_chunk = bytearray(65536)  # Scratch buffer for recv_into
+        self.server_closed = False
         self.packet_loss_prob = packet_loss_prob  # Probability of packet drop for RDT with loss simulation
+        self.chunk_size = chunk_size  # RDT payload bytes per datagram; 1400 keeps packets under a 1500-byte Ethernet MTU
+        self.window_size = window_size  # Maximum number of unacknowledged data packets in flight
+        self.verbose = verbose  # Emit per-packet RDT trace messages
+        logger.setLevel(logging.INFO if verbose else logging.WARNING)
         self.item_name = None  # Track the item name for the seller
         self.payment = None  # Track the payment for the item
         self.expected_seller_ip = None  # To store the expected seller's IP
@@ -57,21 +117,107 @@ class AuctionClient:
         except Exception as e:
             print(f"Failed to connect to server: {e}")
             return False
+
+        self.selector.register(self.client_socket, selectors.EVENT_READ, "server")
+        try:
+            self.selector.register(sys.stdin, selectors.EVENT_READ, "input")
+            self.stdin_selectable = True
+        except (ValueError, OSError):
+            pass  # Not pollable (e.g. redirected from a file); reads will never block anyway
         return True
 
     def send_message(self, message):
         """Send a message to the server."""
         try:
-            self.client_socket.sendall(message.encode())  # Ensure full message is sent
-        except (BrokenPipeError, ConnectionResetError):
-            # Handle server disconnection or broken connection
+            data = message.encode() if isinstance(message, str) else message
+            self.client_socket.sendall(FRAME.pack(len(data)) + data)  # Ensure full, length-prefixed message is sent
+        except OSError:
+            # Handle server disconnection or broken connection; later reads then report the closed connection
             print("Server connection lost.")
+            self.mark_server_closed()
             self.client_socket.close()
 
+    def mark_server_closed(self):
+        """Record that the server connection is gone and stop polling its socket."""
+        if not self.server_closed:
+            self.server_closed = True
+            self.selector.unregister(self.client_socket)
+
+    def drain_socket(self):
+        """Move everything queued on the server socket into the receive buffer; return False once it is closed."""
+        dontwait = getattr(socket, "MSG_DONTWAIT", 0)
+        flags = 0  # The first read is known to be ready; the rest must not block
+        while True:
+            try:
+                n = self.client_socket.recv_into(self.recv_chunk, 0, flags)
+            except BlockingIOError:
+                return True
+            except OSError:
+                n = 0  # A reset connection is handled like an orderly close
+            if n == 0:
+                self.mark_server_closed()
+                return False
+            self.recv_buffer += memoryview(self.recv_chunk)[:n]
+            if not dontwait:
+                return True  # Without non-blocking reads, take one read per wakeup
+            flags = dontwait
+
+    def read_stdin(self):
+        """Append whatever the user has typed to the input buffer."""
+        chunk = os.read(sys.stdin.fileno(), 1024)
+        if not chunk:
+            self.stdin_eof = True
+            if self.stdin_selectable:
+                self.selector.unregister(sys.stdin)
+                self.stdin_selectable = False
+        self.input_buffer += chunk
+
+    def poll_events(self, timeout=None):
+        """Wait for the server or the user and buffer whatever arrived from either of them."""
+        for key, _ in self.selector.select(timeout):
+            if key.data == "input":
+                self.read_stdin()
+            else:
+                self.drain_socket()
+
+    def read_input(self):
+        """Return the next line typed by the user, or None if input ended or the server went away first."""
+        while True:
+            line_end = self.input_buffer.find(b"\n")
+            if line_end >= 0:
+                line = self.input_buffer[:line_end].decode().rstrip("\r")
+                del self.input_buffer[:line_end + 1]
+                return line
+            if self.stdin_eof:
+                if not self.input_buffer:
+                    return None
+                # Input ended without a newline; the rest is the last line
+                line = self.input_buffer.decode().rstrip("\r")
+                self.input_buffer.clear()
+                return line
+            if self.server_closed:
+                print("Server connection lost.")
+                return None
+            if self.stdin_selectable:
+                self.poll_events()
+            else:
+                self.read_stdin()
+
     def receive_message(self):
-        """Receive a message from the server."""
+        """Receive the next length-prefixed message from the server."""
         try:
-            return self.client_socket.recv(1024).decode()  # Receive data from the server
+            while True:
+                if len(self.recv_buffer) >= FRAME.size:
+                    (length,) = FRAME.unpack_from(self.recv_buffer)
+                    end = FRAME.size + length
+                    if len(self.recv_buffer) >= end:
+                        message = self.recv_buffer[FRAME.size:end].decode()  # Decode only once the frame is complete
+                        del self.recv_buffer[:end]
+                        return message
+                if self.server_closed:
+                    return None
+                # Keep collecting typed-ahead input while waiting so it is not lost
+                self.poll_events()
         except (ConnectionResetError, socket.error):
             # Return None in case of a connection error
             return None
@@ -105,14 +251,18 @@ class AuctionClient:
         """Handle seller operations for initiating an auction."""
         while True:
             print("Please submit auction request:")
-            auction_details = input()  # Get auction details from the seller
+            auction_details = self.read_input()  # Get auction details from the seller
+            if auction_details is None:
+                break
 
             try:
                 # Parse auction details from input
                 auction_type, lowest_price, num_bids, item_name = auction_details.split(maxsplit=3)
-                message = f"{auction_type.strip()} {lowest_price.strip()} {num_bids.strip()} {item_name.strip()}"
+                item_name = item_name.strip()
+                name = item_name.encode()
+                request = AUCTION_REQ.pack(int(auction_type), int(lowest_price), int(num_bids), len(name)) + name
                 self.item_name = item_name  # Store the item name
-                self.send_message(message)  # Send auction request to the server
+                self.send_message(request)  # Send auction request to the server
 
                 response = self.receive_message()  # Wait for server response
                 if response is None:
@@ -126,15 +276,13 @@ class AuctionClient:
 
                 if response:
                     # Parse and print auction result if the item is sold
-                    if "sold for $" in response and "Winning buyer IP" in response:
-                        parts = response.split()
-                        price_index = parts.index("sold") + 2
-                        ip_index = parts.index("IP:") + 1
-                        self.payment = parts[price_index].replace("$", "")
-                        winning_buyer_ip = parts[ip_index]
+                    sold = SOLD_RE.search(response)
+                    if sold:
+                        self.payment = sold["price"]
+                        winning_buyer_ip = sold["ip"]
 
                         print("Auction finished!")
-                        print(f"Success! Your item {self.item_name} has been sold for ${self.payment} Buyer IP: {winning_buyer_ip}")
+                        print(f"Success! Your item {self.item_name} has been sold for ${self.payment}. Buyer IP: {winning_buyer_ip}")
                         print("Disconnecting from the Auctioneer server. Auction is over!")
 
                         # Start the UDP file transfer to the winning buyer
@@ -149,8 +297,8 @@ class AuctionClient:
                 else:
                     print("Server did not respond with auction results.")
                 break
-            except ValueError:
-                # Handle input parsing errors
+            except (ValueError, struct.error):
+                # Handle input parsing errors (non-numeric or out-of-range fields)
                 print("Server: Invalid auction request!")
 
     def is_valid_ip(self, ip):
@@ -161,99 +309,206 @@ class AuctionClient:
         except socket.error:
             return False
 
+    def tune_udp_socket(self, udp_socket):
+        """Enlarge the kernel buffers of an RDT socket and report the sizes actually granted."""
+        for option, name in ((socket.SO_RCVBUF, "receive"), (socket.SO_SNDBUF, "send")):
+            try:
+                udp_socket.setsockopt(socket.SOL_SOCKET, option, UDP_SOCKET_BUFFER)
+            except OSError:
+                pass  # Keep the system default if the request is refused
+            granted = udp_socket.getsockopt(socket.SOL_SOCKET, option)
+            logger.info("UDP %s buffer: %d bytes", name, granted)
+
     def send_file_over_udp(self, seller_ip, buyer_ip, udp_port, file_path="tosend.file"):
-        """Send a file over UDP using a reliable stop-and-wait protocol with packet loss simulation."""
+        """Send a file over UDP using a reliable sliding-window (selective repeat) protocol with packet loss simulation."""
         udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        udp_socket.settimeout(2)  # Timeout for retransmission
+        self.tune_udp_socket(udp_socket)
 
+        file = None  # Closed in the finally block however the transfer ends
         try:
             print("UDP socket opened for RDT.\nStart sending file.")
-            with open(file_path, "rb") as file:
-                data = file.read()
-            
-            total_size = len(data)
+            file = open(file_path, "rb")
+            total_size = os.fstat(file.fileno()).st_size
             if total_size == 0:  # Handle empty file case
                 print("Error: File is empty. Nothing to send.")
-                udp_socket.close()
                 return
 
-            chunk_size = 2000
-            seq_num = 0  # Start sequence number at 0
-            bytes_sent = 0  # Track total bytes sent
+            chunk_size = self.chunk_size
+            window_size = self.window_size
+            seq_num = 0  # The control packet uses sequence number 0, data packets count up from 1
+
+            # Preallocated packet buffers, reused for every (re)transmission
+            pkt_buf = bytearray(HDR_SIZE + chunk_size)
+            mv = memoryview(pkt_buf)
+            # Hot-loop callables bound to locals to skip attribute and global lookups
+            send = udp_socket.sendto
+            recv_into = udp_socket.recvfrom_into
+            wait_readable = select.select
+            clock = time.time
+            sendmsg = getattr(udp_socket, "sendmsg", None)  # Gather I/O, unavailable on Windows
+            buyer_addr = (buyer_ip, udp_port)
+
+            # Persistent receive buffer for acknowledgments
+            recv_buf = bytearray(2048)
+            recv_mv = memoryview(recv_buf)
+
+            drop = make_drop_fn(self.packet_loss_prob)
+
+            # Retransmission timeout, adapted from measured round-trip times (Jacobson/Karels).
+            # Until the first sample arrives a randomized initial value is used.
+            rto = random.uniform(MIN_RTO, INITIAL_RTO_MAX)
+            srtt = None
+            rttvar = None
+
+            def on_rtt_sample(sample):
+                nonlocal rto, srtt, rttvar
+                if srtt is None:
+                    srtt, rttvar = sample, sample / 2
+                else:
+                    rttvar = 0.75 * rttvar + 0.25 * abs(srtt - sample)
+                    srtt = 0.875 * srtt + 0.125 * sample
+                rto = min(max(srtt + 4 * rttvar, MIN_RTO), MAX_RTO)
+
+            def wait_for_ack(seq, pkt, sent_at, simulate_drop):
+                # Stop-and-wait for the ack of a single control packet, backing off on every timeout
+                nonlocal rto
+                retransmitted = False
+                while True:
+                    readable, _, _ = wait_readable([udp_socket], [], [], rto)
+                    if not readable:
+                        rto = min(rto * 2, MAX_RTO)
+                        logger.info("Msg re-sent: %d", seq)
+                        send(pkt, buyer_addr)
+                        sent_at = clock()
+                        retransmitted = True
+                        continue
 
-            # Send control packet
-            control_packet = f"start {total_size}".encode()
-            udp_socket.sendto(bytes([seq_num, 0]) + control_packet, (buyer_ip, udp_port))
-            print(f"Sending control seq {seq_num}: start {total_size}")
-            is_first_send = True
-            # Wait for acknowledgment of the control packet
-            while True:
-                try:
-                    ack, addr = udp_socket.recvfrom(1024)
-                    if addr[0] == buyer_ip and ack == bytes([seq_num, 0]):
+                    nbytes, addr = recv_into(recv_buf)
+                    if addr[0] == buyer_ip and nbytes == HDR_SIZE and HDR.unpack_from(recv_buf) == (seq, 0):
                         # Simulate acknowledgment drop
-                        if self.packet_loss_prob and random.random() < self.packet_loss_prob:
-                            print(f"Ack dropped: {seq_num}")
+                        if simulate_drop and drop():
+                            logger.info("Ack dropped: %d", seq)
                             continue  # Simulate acknowledgment drop
 
-                        print(f"Ack received: {seq_num}")
-                        seq_num = 1 - seq_num  # Toggle sequence number for next packet
-                        break
-                except socket.timeout:
-                    if is_first_send:
-                        udp_socket.sendto(bytes([seq_num, 0]) + control_packet, (buyer_ip, udp_port))
-                        is_first_send = False
-                    else:
-                        print(f"Msg re-sent: {seq_num}")
-                        udp_socket.sendto(bytes([seq_num, 0]) + control_packet, (buyer_ip, udp_port))
-
-            # Send data packets
-            for i in range(0, total_size, chunk_size):
-                chunk = data[i:i + chunk_size]  # Initialize `chunk` properly within the loop
-                packet = bytes([seq_num, 1]) + chunk  # Create packet with sequence number and type flag
-                is_first_send = True  # Track if this is the first send of the packet
+                        if not retransmitted:  # Karn's rule: ambiguous samples are skipped
+                            on_rtt_sample(clock() - sent_at)
+                        logger.info("Ack received: %d", seq)
+                        return
 
-                while True:
-                    if is_first_send:
-                        print(f"Sending data seq {seq_num}: {bytes_sent + len(chunk)} / {total_size}")
-                        is_first_send = False  # Mark as sent for the first time
-                    else:
-                        print(f"Msg re-sent: {seq_num}")
+            # Send control packet
+            control_packet = f"start {total_size} {chunk_size}".encode()
+            ctrl_buf = bytearray(HDR_SIZE + len(control_packet))
+            ctrl_buf[HDR_SIZE:] = control_packet
+            HDR.pack_into(ctrl_buf, 0, seq_num, 0)
+            send(ctrl_buf, buyer_addr)
+            logger.info("Sending control seq %d: start %d", seq_num, total_size)
+            # Wait for acknowledgment of the control packet
+            wait_for_ack(seq_num, ctrl_buf, clock(), simulate_drop=True)
 
-                    udp_socket.sendto(packet, (buyer_ip, udp_port))
+            # Read the file on a background thread so disk reads overlap with transmission.
+            # The bounded queue caps read-ahead, keeping memory at O(window) chunks.
+            chunk_queue = queue.Queue(maxsize=window_size)
 
-                    try:
-                        ack, addr = udp_socket.recvfrom(1024)
-                        if addr[0] == buyer_ip and ack == bytes([seq_num, 0]):
+            def read_chunks():
+                error = None
+                try:
+                    while chunk := file.read(chunk_size):
+                        chunk_queue.put(chunk)
+                except Exception as e:
+                    error = e
+                finally:
+                    # Always unblock the sender: None marks the end of the file, an exception is re-raised there
+                    chunk_queue.put(error)
+
+            threading.Thread(target=read_chunks, daemon=True).start()
+
+            def send_data(seq, chunk):
+                n = len(chunk)
+                HDR.pack_into(pkt_buf, 0, seq, 1)
+                if sendmsg is not None:
+                    # Gather the header and the payload in one syscall without assembling a packet
+                    sendmsg([mv[:HDR_SIZE], chunk], (), 0, buyer_addr)
+                else:
+                    # Fill the packet buffer in place with the payload after the header
+                    mv[HDR_SIZE:HDR_SIZE + n] = chunk
+                    send(mv[:HDR_SIZE + n], buyer_addr)
+
+            # Send data packets, keeping up to window_size of them unacknowledged
+            trace = logger.isEnabledFor(logging.INFO)  # Checked once so the quiet hot loop skips logging calls
+            unacked = {}  # seq -> time of the last transmission
+            chunks = {}  # seq -> payload, kept until acknowledged for retransmission
+            retransmitted = set()  # Sequence numbers whose ack cannot yield an RTT sample
+            next_seq = 1
+            bytes_queued = 0  # Bytes handed to the network so far, for progress output
+            eof = False
+            while not eof or unacked:
+                while not eof and len(unacked) < window_size:
+                    chunk = chunk_queue.get()
+                    if chunk is None:
+                        eof = True
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk  # The reader thread failed to read the file
+                    send_data(next_seq, chunk)
+                    bytes_queued += len(chunk)
+                    if trace:
+                        logger.info("Sending data seq %d: %d / %d", next_seq, bytes_queued, total_size)
+                    unacked[next_seq] = clock()
+                    chunks[next_seq] = chunk
+                    next_seq += 1
+                if not unacked:
+                    continue
+
+                # Wait for an acknowledgment until the oldest outstanding packet times out
+                wait = max(0.0, min(unacked.values()) + rto - clock())
+                readable, _, _ = wait_readable([udp_socket], [], [], wait)
+                if readable:
+                    nbytes, addr = recv_into(recv_buf)
+                    # The receiver batches acks: one datagram carries one or more headers
+                    if addr[0] == buyer_ip and nbytes and nbytes % HDR_SIZE == 0:
+                        for ack_seq, type_flag in HDR.iter_unpack(recv_mv[:nbytes]):
+                            if type_flag != 0 or ack_seq not in unacked:
+                                continue
                             # Simulate acknowledgment drop
-                            if self.packet_loss_prob and random.random() < self.packet_loss_prob:
-                                print(f"Ack dropped: {seq_num}")
-                                continue  # Simulate acknowledgment drop
-
-                            print(f"Ack received: {seq_num}")
-                            seq_num = 1 - seq_num  # Toggle sequence number for next packet
-                            bytes_sent += len(chunk)  # Increment bytes_sent after a successful send
-                            break  # Exit loop and move to the next packet
-                    except socket.timeout:
-                        # Timeout handling - stay in the loop to resend the packet
-                        continue
+                            if drop():
+                                if trace:
+                                    logger.info("Ack dropped: %d", ack_seq)
+                            else:
+                                if trace:
+                                    logger.info("Ack received: %d", ack_seq)
+                                sent_at = unacked.pop(ack_seq)
+                                if ack_seq in retransmitted:
+                                    retransmitted.discard(ack_seq)
+                                else:
+                                    on_rtt_sample(clock() - sent_at)
+                                del chunks[ack_seq]
+
+                # Timeout handling - resend every packet whose timer has expired
+                now = clock()
+                expired = [seq for seq, sent_at in unacked.items() if now - sent_at >= rto]
+                if expired:
+                    rto = min(rto * 2, MAX_RTO)  # Exponential backoff, once per timeout event
+                    for seq in expired:
+                        if trace:
+                            logger.info("Msg re-sent: %d", seq)
+                        send_data(seq, chunks[seq])
+                        unacked[seq] = now
+                        retransmitted.add(seq)
 
             # Send the end-of-transmission signal
-            udp_socket.sendto(bytes([seq_num, 0]) + b"fin", (buyer_ip, udp_port))
-            print(f"Sending control seq {seq_num}: fin")
+            seq_num = next_seq
+            fin_buf = bytearray(HDR_SIZE + 3)
+            fin_buf[HDR_SIZE:] = b"fin"
+            HDR.pack_into(fin_buf, 0, seq_num, 0)
+            send(fin_buf, buyer_addr)
+            logger.info("Sending control seq %d: fin", seq_num)
 
             # Wait for acknowledgment of the `fin` packet
-            while True:
-                try:
-                    ack, addr = udp_socket.recvfrom(1024)
-                    if addr[0] == buyer_ip and ack == bytes([seq_num, 0]):
-                        print(f"Ack received: {seq_num}")
-                        break  # Break after receiving acknowledgment for the `fin`
-                except socket.timeout:
-                    print(f"Msg re-sent: {seq_num}")
-                    udp_socket.sendto(bytes([seq_num, 0]) + b"fin", (buyer_ip, udp_port))
+            wait_for_ack(seq_num, fin_buf, time.time(), simulate_drop=False)
 
         finally:
+            if file is not None:
+                file.close()
             udp_socket.close()
             print("UDP socket closed after transfer.")
 
@@ -270,14 +525,23 @@ class AuctionClient:
             print("The bidding has started!")
             self.buyer_mode()  # Start the bidding process
 
+    def encode_bid(self, bid):
+        """Pack a bid as a 32-bit integer; input that is not one is sent as 0 so the server rejects it."""
+        try:
+            return BID.pack(int(bid))
+        except (ValueError, struct.error):
+            return BID.pack(0)
+
     def buyer_mode(self):
         """Handle the bidding process for the buyer."""
         self.expected_seller_ip = None  # Initialize to store the seller's IP
 
         while True:
             print("Please submit your bid:")
-            bid = input()  # Get the bid from the buyer
-            self.send_message(bid)  # Send the bid to the server
+            bid = self.read_input()  # Get the bid from the buyer
+            if bid is None:
+                break
+            self.send_message(self.encode_bid(bid))  # Send the bid to the server
             response = self.receive_message()  # Wait for the server response
 
             if response is None:
@@ -295,27 +559,26 @@ class AuctionClient:
                 if response is None:
                     print("Server is busy. Try to connect again later.")
                     break
-                print(f"Server: {response}")
+                # The winner's result carries the seller's IP on a SELLER_IP line; show only the notice
+                print(f"Server: {SELLER_IP_RE.sub('', response).rstrip()}")
 
                 if "You won the item" in response:  # If the buyer wins the auction
-                    # Read all remaining messages to find the seller's IP
+                    # Read all remaining messages to find the seller's IP, starting with what already arrived
+                    seller_ip_message = response
                     while True:
-                        seller_ip_message = self.receive_message()
-                        if not seller_ip_message:
-                            break
 
-                        # Split the response into lines and find the seller's IP
-                        lines = seller_ip_message.strip().split("\n")
-                        for line in lines:
-                            if line.startswith("SELLER_IP"):
-                                parts = line.split()
-                                if len(parts) == 2:
-                                    self.expected_seller_ip = parts[1]  # Store the seller IP
-                                    break  # Exit loop once IP is found
+                        # Find the line carrying the seller's IP
+                        seller_ip = SELLER_IP_RE.search(seller_ip_message)
+                        if seller_ip:
+                            self.expected_seller_ip = seller_ip[1]  # Store the seller IP
 
                         if self.expected_seller_ip:
                             break  # Stop reading once the IP is found
 
+                        seller_ip_message = self.receive_message()
+                        if not seller_ip_message:
+                            break
+
                     if not self.expected_seller_ip:
                         print("Error: Did not receive seller's IP for UDP transfer.")
                         return  # Exit if the seller IP is not found
@@ -331,77 +594,144 @@ class AuctionClient:
             break  # Exit after processing the auction result
 
     def receive_file_over_udp(self, udp_port, expected_file_path="recved.file"):
-        """Receive a file over UDP using a reliable stop-and-wait protocol with packet loss simulation."""
+        """Receive a file over UDP using a reliable sliding-window (selective repeat) protocol with packet loss simulation."""
         udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tune_udp_socket(udp_socket)
         udp_socket.bind(("", udp_port))
-        udp_socket.settimeout(2)  # Timeout set according to specifications
 
+        out_file = None  # Opened and sized once the 'start' control packet announces the file size
+        completed = False  # Set once 'fin' arrives; until then the file is only partly written
         try:
             print("UDP socket opened for RDT.\nStart receiving file.")
-            buffer = b""  # Initialize the buffer for storing data
-            expected_seq = 0
+            chunk_size = None  # Payload size used by the sender, announced in the 'start' packet
+            received = None  # One flag per data sequence number, set once its chunk is stored
+            last_seq = 0  # Highest valid data sequence number, known once 'start' arrives
+            recv_buf = bytearray(self.chunk_size + 64)  # Persistent buffer reused for every incoming packet
+            recv_mv = memoryview(recv_buf)
+            ack_buf = bytearray(HDR_SIZE)  # Type flag stays 0; only the sequence number is rewritten per ack
             total_bytes_received = 0
             expected_size = None  # Initialize expected size
             first_packet_received = False  # Flag to track if the first packet has been received
+            trace = logger.isEnabledFor(logging.INFO)  # Checked once so the quiet hot loop skips logging calls
+            drop = make_drop_fn(self.packet_loss_prob)
+            pwrite = getattr(os, "pwrite", None)  # Positional write, unavailable on Windows
+
+            # Hot-loop callables and settings bound to locals to skip attribute and global lookups
+            recv_into = udp_socket.recvfrom_into
+            send = udp_socket.sendto
+            expected_ip = self.expected_seller_ip
+
+            # Packets are handled in bursts: block for the first one, then drain what the kernel has
+            # already queued without blocking and acknowledge the whole burst in a single datagram.
+            dontwait = getattr(socket, "MSG_DONTWAIT", 0)
+            batch_limit = RECV_BATCH if dontwait else 1
+            flags = 0
+            batched = 0
+            pending_acks = bytearray()  # Concatenated ack headers for the current burst
+            ack_addr = None
+
+            def flush_acks():
+                if pending_acks:
+                    send(pending_acks, ack_addr)
+                    pending_acks.clear()
 
             # Start time tracking for BPS calculation
             start_time = time.time()
 
             while True:
                 try:
-                    packet, addr = udp_socket.recvfrom(2048)
-                    if not packet or len(packet) < 2:
+                    if batched >= batch_limit:
+                        flush_acks()
+                        flags = batched = 0
+                    try:
+                        nbytes, addr = recv_into(recv_buf, 0, flags)
+                    except BlockingIOError:
+                        # Burst drained, acknowledge it and block for the next one
+                        flush_acks()
+                        flags = batched = 0
+                        continue
+                    flags = dontwait
+                    batched += 1
+                    if nbytes < HDR_SIZE:
                         continue
 
-                    seq_num, type_flag = packet[0], packet[1]
+                    seq_num, type_flag = HDR.unpack_from(recv_buf)
 
                     # Ensure packet drop simulation only runs after the first packet is received
-                    if first_packet_received and self.packet_loss_prob and random.random() < self.packet_loss_prob:
-                        print(f"Pkt dropped: {seq_num}")
+                    if first_packet_received and drop():
+                        if trace:
+                            logger.info("Pkt dropped: %d", seq_num)
                         continue  # Simulate packet drop and skip processing
 
                     # Process only if packet is from the expected sender
-                    if addr[0] == self.expected_seller_ip:
+                    if not first_packet_received and addr[0] == expected_ip:
                         first_packet_received = True  # Mark that the first packet has been received
 
-                    if seq_num == expected_seq:
-                        print(f"Msg received: {seq_num}")
-                        if type_flag == 0:  # Control packet
-                            if packet[2:].decode().startswith("start"):
-                                expected_size = int(packet[2:].decode().split()[1])
-                                print(f"Ack sent: {seq_num}")
-                                udp_socket.sendto(bytes([seq_num, 0]), addr)
-                                expected_seq = 1  # Set for next packet
-                                continue
-                            elif packet[2:].decode() == "fin":
-                                print(f"Ack sent: {seq_num}")
-                                udp_socket.sendto(bytes([seq_num, 0]), addr)  # Send final ACK for fin
-                                break  # Exit after acknowledging the 'fin' signal
-
-                        if type_flag == 1:  # Data packet
-                            buffer += packet[2:]
-                            total_bytes_received += len(packet) - 2
-                            print(f"Ack sent: {seq_num}")
-                            print(f"Received data seq {seq_num}: {total_bytes_received} / {expected_size}") 
-                            udp_socket.sendto(bytes([seq_num, 0]), addr)
-                            expected_seq = 1 - expected_seq  # Toggle expected sequence
-
-                            if expected_size and total_bytes_received >= expected_size:
-                                continue  # Wait for 'fin' packet after receiving the complete data
-                    else:
-                        # Handle sequence mismatch case
-                        print(f"Msg received with mismatched sequence number {seq_num}. Expecting {expected_seq}")
-                        udp_socket.sendto(bytes([1 - expected_seq, 0]), addr)
-                        print(f"Ack re-sent: {1 - expected_seq}")
-
-
-                except socket.timeout:
-                    continue  # Handle timeout for waiting for packets
+                    # The ack echoes the packet's sequence number bytes, copied without re-encoding
+                    ack_buf[:HDR_SIZE - 1] = recv_mv[:HDR_SIZE - 1]
+
+                    # Data packets are by far the most frequent, so they are tested first
+                    if type_flag == 1 and 0 < seq_num <= last_seq:  # Data packet
+                        if received[seq_num]:
+                            # Duplicate of a chunk already stored, its ack must have been lost
+                            pending_acks += ack_buf
+                            ack_addr = addr
+                            if trace:
+                                logger.info("Msg received with duplicate sequence number %d", seq_num)
+                                logger.info("Ack re-sent: %d", seq_num)
+                            continue
+
+                        # Write the chunk straight to its absolute file position so out-of-order arrivals land correctly
+                        offset = (seq_num - 1) * chunk_size
+                        n = nbytes - HDR_SIZE
+                        if pwrite is not None:
+                            pwrite(out_fd, recv_mv[HDR_SIZE:nbytes], offset)
+                        else:
+                            out_file.seek(offset)
+                            out_file.write(recv_mv[HDR_SIZE:nbytes])
+                        received[seq_num] = 1
+                        total_bytes_received += n
+                        pending_acks += ack_buf
+                        ack_addr = addr
+                        if trace:
+                            logger.info("Msg received: %d", seq_num)
+                            logger.info("Ack sent: %d", seq_num)
+                            logger.info("Received data seq %d: %d / %d", seq_num, total_bytes_received, expected_size)
+
+                    elif type_flag == 0:  # Control packet
+                        flush_acks()  # Keep control acks in their own datagram
+                        logger.info("Msg received: %d", seq_num)
+                        control = bytes(recv_mv[HDR_SIZE:nbytes]).decode()
+                        if control.startswith("start"):
+                            if out_file is None:
+                                _, size, chunk = control.split()
+                                expected_size, chunk_size = int(size), int(chunk)
+                                out_file = open(expected_file_path, "wb", buffering=0)
+                                out_file.truncate(expected_size)
+                                out_fd = out_file.fileno()
+                                last_seq = (expected_size + chunk_size - 1) // chunk_size
+                                received = bytearray(last_seq + 1)
+                                if HDR_SIZE + chunk_size > len(recv_buf):
+                                    # The sender uses larger chunks than this client; grow the buffer so data is not truncated
+                                    recv_buf = bytearray(chunk_size + 64)
+                                    recv_mv = memoryview(recv_buf)
+                            logger.info("Ack sent: %d", seq_num)
+                            send(ack_buf, addr)
+                        elif control == "fin":
+                            logger.info("Ack sent: %d", seq_num)
+                            send(ack_buf, addr)  # Send final ACK for fin
+                            completed = True
+                            break  # Exit after acknowledging the 'fin' signal
 
                 except Exception as e:
                     print(f"Error: {e}")
                     break
 
+            if not completed:
+                print("Error: Transfer did not complete; the partial file is discarded.")
+                return
+
             # End time tracking and calculate BPS
             end_time = time.time()
             duration = end_time - start_time
@@ -411,30 +741,34 @@ class AuctionClient:
                 print(f"Transmission finished: {total_bytes_received} bytes / {duration:.6f} seconds = {bps:,.6f} bps")
             else:
                 print("Error: Transmission duration is zero or negative, cannot calculate BPS.")
-            
-            # Write the received buffer to a file
-            if buffer:
-                with open(expected_file_path, "wb") as f:
-                    f.write(buffer)
-                #print(f"File saved as '{expected_file_path}'")
 
         finally:
+            if out_file is not None:
+                out_file.close()  # Data was written as it arrived
+                if not completed:
+                    os.remove(expected_file_path)  # Do not leave a zero-padded file behind
             udp_socket.close()
             print("UDP socket closed after receiving.")
 
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 4:
-        print("Usage: python3 auc_client_rdt.py <server_ip> <port> <udp_port> [packet_loss_prob]")
+    # '--quiet' suppresses the per-packet RDT trace
+    quiet = "--quiet" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--quiet"]
+    if len(args) < 3:
+        print("Usage: python3 auc_client_rdt.py <server_ip> <port> <udp_port> [packet_loss_prob] [--quiet]")
         sys.exit(1)
 
     # Parse command-line arguments
-    server_ip = sys.argv[1]
-    port = int(sys.argv[2])
-    udp_port = int(sys.argv[3])
-    packet_loss_prob = float(sys.argv[4]) if len(sys.argv) == 5 else None
+    server_ip = args[0]
+    port = int(args[1])
+    udp_port = int(args[2])
+    packet_loss_prob = float(args[3]) if len(args) == 4 else None
+
+    # Trace messages go to stdout alongside the regular client output
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
 
     # Create and run the auction client
-    client = AuctionClient(server_ip, port, udp_port, packet_loss_prob)
+    client = AuctionClient(server_ip, port, udp_port, packet_loss_prob, verbose=not quiet)
     client.run()